@@ -38,22 +38,407 @@ Usage:
 
 import sqlite3
 import datetime
+import itertools
 import json
+import os
+import queue
+import tempfile
+import threading
+import time
+import weakref
+from concurrent.futures import Future, wait
+from contextlib import contextmanager
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
 from dateutil.relativedelta import relativedelta
 
+try:
+    import orjson  # Optional: faster JSON serialization for exports
+except ImportError:
+    orjson = None
+
+
+def _dump_json(obj: Any) -> str:
+    """Serialize obj as 2-space indented JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, indent=2)
+
+
+_EMPTY_JSON = "{}"
+
+
+def _dump_metadata(metadata: Optional[Dict]) -> str:
+    """Serialize a metadata dict compactly, skipping the encoder when empty"""
+    if not metadata:
+        return _EMPTY_JSON
+    if orjson is not None:
+        return orjson.dumps(metadata, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(metadata, separators=(",", ":"))
+
+
+def _load_metadata(raw: Optional[str]) -> Dict:
+    """Parse a metadata column, skipping the parser for the common empty case"""
+    if not raw or raw == _EMPTY_JSON:
+        return {}
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+_YEARS_PER_DAY = 1 / 365.25
+
+
+@lru_cache(maxsize=4096)
+def _parse_purchase_date(value: str) -> datetime.date:
+    """Parse a purchase date, as a plain date when it carries no time part"""
+    if len(value) == 10:
+        return datetime.date.fromisoformat(value)
+    return datetime.datetime.fromisoformat(value)
+
+
+def _age_days(purchase_date: str, now: datetime.datetime) -> int:
+    """Whole days elapsed between purchase_date and now"""
+    purchase = _parse_purchase_date(purchase_date)
+    if isinstance(purchase, datetime.datetime):
+        return (now - purchase).days
+    return (now.date() - purchase).days
+
+
+# The writer thread commits whatever has queued up, capped at this many rows
+# or this many seconds per transaction
+_WRITE_BATCH_ROWS = 1000
+_WRITE_BATCH_WINDOW = 0.01
+
+# Names the shared-cache database behind each HappyPlaces(":memory:")
+_memory_ids = itertools.count()
+
+
+class _WriteFuture(Future):
+    """Future for a queued write that remembers whether anyone has looked at its outcome"""
+    
+    def __init__(self, failures: list):
+        super().__init__()
+        # The submitting thread's list of failed writes (see _WriteQueue._fail)
+        self.failures = failures
+        self.seen = False
+
+    def result(self, timeout=None):
+        try:
+            return super().result(timeout)
+        finally:
+            self.seen = self.done()
+
+    def exception(self, timeout=None):
+        exc = super().exception(timeout)
+        self.seen = True
+        return exc
+
+
+class _WriteQueue:
+    """
+    Background writer shared by a HappyPlaces instance.
+    
+    Owns the write connection and the thread that drains queued writes into
+    it. It holds no reference back to HappyPlaces, so the instance can still
+    be garbage-collected while the thread is running.
+    """
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run,
+                                       name="happy-places-writer", daemon=True)
+
+    @contextmanager
+    def transaction(self):
+        """Run a block inside BEGIN/COMMIT on the write connection, rolling back on error"""
+        conn = self.conn
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _fail(self, future: Future, exc: BaseException) -> None:
+        # Recorded before the future resolves so waiters always find it
+        if isinstance(future, _WriteFuture):
+            future.failures.append(future)
+        future.set_exception(exc)
+
+    def stop(self) -> None:
+        """Commit everything still queued, then stop the thread"""
+        self.queue.put(None)
+        self.thread.join()
+
+    def _run(self) -> None:
+        """Drain the queue, committing pending writes in batches"""
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            
+            batch = [job]
+            rows = sum(len(r) for _, r in job[0])
+            deadline = time.monotonic() + _WRITE_BATCH_WINDOW
+            stop = False
+            while rows < _WRITE_BATCH_ROWS and time.monotonic() < deadline:
+                try:
+                    job = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    stop = True
+                    break
+                batch.append(job)
+                rows += sum(len(r) for _, r in job[0])
+            
+            self._commit_batch(batch)
+            if stop:
+                return
+
+    def _commit_batch(self, batch: List[tuple]) -> None:
+        """Commit a batch of queued writes in one transaction"""
+        with self.lock:
+            try:
+                self._apply_ops([op for ops, _ in batch for op in ops])
+            except Exception as exc:
+                if len(batch) == 1:
+                    self._fail(batch[0][1], exc)
+                    return
+                # Replay each write on its own so only the failing ones error
+                for ops, future in batch:
+                    try:
+                        self._apply_ops(ops)
+                    except Exception as exc:
+                        self._fail(future, exc)
+                    else:
+                        future.set_result(None)
+                return
+        
+        for _, future in batch:
+            future.set_result(None)
+
+    def _apply_ops(self, ops: List[tuple]) -> None:
+        """Execute (sql, rows) pairs in one transaction, merging runs of the same statement"""
+        with self.transaction() as conn:
+            for sql, group in itertools.groupby(ops, key=lambda op: op[0]):
+                conn.executemany(sql, [row for _, rows in group for row in rows])
+
+
+def _shutdown(writes: _WriteQueue, conn: sqlite3.Connection) -> None:
+    """Commit queued writes, refresh planner statistics and close both connections"""
+    writes.stop()
+    # PRAGMA optimize looks at the queries a connection has run, so it has to
+    # run on the read connection; the writer only ever inserts
+    conn.execute("PRAGMA optimize")
+    writes.conn.close()
+    conn.close()
+
 
 class HappyPlaces:
     def __init__(self, db_path: str = "happy_places.db"):
         self.db_path = db_path
+        # ":memory:" would give each connection its own empty database, so
+        # point both at one named in-memory database instead
+        if db_path == ":memory:":
+            self._database = f"file:happy_places_{next(_memory_ids)}?mode=memory&cache=shared"
+        else:
+            self._database = db_path
+        
+        # Hot-path SQL is kept as fixed strings so sqlite3's statement cache
+        # (keyed on the exact text) reuses the compiled statements
+        self._stmt_insert_item = """
+            INSERT OR REPLACE INTO items
+            (item_id, label, category, purchase_date, expected_lifespan_years,
+             current_quantity, refill_threshold, usage_rate_per_day, metadata)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        self._stmt_insert_placement = """
+            INSERT INTO placements
+            (item_id, zone, distribution_type, routine, motive, timestamp, metadata)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """
+        self._stmt_insert_copresence = """
+            INSERT INTO co_presence (item_a, item_b, zone, timestamp)
+            VALUES (?, ?, ?, ?)
+        """
+        self._stmt_item_row = """
+            SELECT label, category, purchase_date, expected_lifespan_years,
+                   current_quantity, refill_threshold, usage_rate_per_day, metadata
+            FROM items WHERE item_id = ?
+        """
+        self._stmt_latest_placement = """
+            SELECT zone, distribution_type, routine, motive, timestamp
+            FROM placements WHERE item_id = ?
+            ORDER BY timestamp DESC, placement_id DESC LIMIT 1
+        """
+        self._stmt_insert_zone = """
+            INSERT OR REPLACE INTO zones (zone_id, zone_name, description)
+            VALUES (?, ?, ?)
+        """
+        
+        # Reads go through self._conn. Writes are queued and committed in
+        # batches by a single background thread (self._writes) that owns its
+        # own connection. Both run in autocommit mode.
+        self._conn = self._open_connection()
+        self._writes = _WriteQueue(self._open_connection())
+        self._local = threading.local()
         self._init_db()
+        self._writes.thread.start()
+        # Runs on close(), when the instance is garbage-collected, or at exit
+        self._finalizer = weakref.finalize(self, _shutdown, self._writes, self._conn)
+
+    def _open_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._database, isolation_level=None,
+                               check_same_thread=False,
+                               cached_statements=256,
+                               uri=self._database != self.db_path)
+        # NORMAL sync skips the per-commit fsync under WAL (still durable
+        # across application crashes)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")  # ~20 MB
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        return conn
+
+    @contextmanager
+    def _reader(self):
+        """Read from the read connection once this thread's queued writes have landed"""
+        pending = getattr(self._local, "last_write", None)
+        if pending is not None:
+            wait([pending])
+            self._local.last_write = None
+        self._raise_write_error()
+        if self.db_path == ":memory:":
+            # Connections to a shared-cache database lock whole tables, so a
+            # read while the writer is mid-transaction fails with "database
+            # table is locked"; take turns with the writer instead
+            with self._writes.lock:
+                yield self._conn
+        else:
+            yield self._conn
+
+    def _raise_write_error(self) -> None:
+        """Re-raise the first failed write from this thread that nobody has checked"""
+        failures = getattr(self._local, "failures", None)
+        if not failures:
+            return
+        failed = failures[:]
+        del failures[:len(failed)]
+        for future in failed:
+            if not future.seen:
+                raise future.exception()
+
+    # ===== WRITE QUEUE =====
 
-    def _connect(self):
-        return sqlite3.connect(self.db_path)
+    def _submit(self, ops: List[tuple]) -> Future:
+        """Queue (sql, rows) pairs to be committed together by the writer thread"""
+        if not self._finalizer.alive:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        # Failures are kept per thread, so they go away with the thread
+        # instead of surfacing on whichever thread later reuses its ident
+        failures = getattr(self._local, "failures", None)
+        if failures is None:
+            failures = self._local.failures = []
+        future = _WriteFuture(failures)
+        pending = getattr(self._local, "bulk", None)
+        if pending is not None:
+            pending.append((ops, future))
+            return future
+        self._writes.queue.put((ops, future))
+        self._local.last_write = future
+        return future
+
+    @contextmanager
+    def bulk(self):
+        """
+        Group writes into a single transaction.
+        
+        Writes made on this thread inside the block are held back and
+        committed together when it exits, or discarded if it raises. Reads
+        inside the block don't see them yet, and their Futures only resolve
+        after the block exits, so don't wait on them (or call flush(),
+        maintenance() or snapshot_to_memory()) inside it.
+        
+            with hp.bulk():
+                hp.register_zone("kitchen_table", "Kitchen Table")
+                hp.register_item("wallet", label="Wallet", category="good_stuff")
+        """
+        if getattr(self._local, "bulk", None) is not None:
+            yield self
+            return
+        
+        self._local.bulk = pending = []
+        try:
+            yield self
+        except BaseException:
+            for _, future in pending:
+                future.cancel()
+            raise
+        finally:
+            self._local.bulk = None
+        
+        try:
+            self._submit([op for ops, _ in pending for op in ops]).result()
+        except Exception as exc:
+            for _, future in pending:
+                future.set_exception(exc)
+            raise
+        for _, future in pending:
+            future.set_result(None)
+
+    def _check_not_in_bulk(self, action: str) -> None:
+        # Held-back bulk writes only reach the queue when the block exits,
+        # so waiting on them from inside it would never return
+        if getattr(self._local, "bulk", None) is not None:
+            raise sqlite3.ProgrammingError(f"Cannot {action} inside bulk().")
+
+    def flush(self) -> None:
+        """
+        Block until every write queued so far has been committed.
+        
+        Raises the first error from this thread's writes that hasn't already
+        been seen through its Future.
+        """
+        self._check_not_in_bulk("flush")
+        self._submit([]).result()
+        self._raise_write_error()
+
+    def close(self) -> None:
+        """Commit queued writes, refresh planner statistics and close the database"""
+        self._finalizer()
+        self._raise_write_error()
+
+    def snapshot_to_memory(self) -> "HappyPlaces":
+        """
+        Copy the database into a new in-memory HappyPlaces.
+        
+        Useful for running the read-heavy analytics (distribution_patterns,
+        routine_insights, items_needing_attention) without touching disk.
+        The snapshot is independent of this instance; close it when done.
+        """
+        self._check_not_in_bulk("take a snapshot")
+        self.flush()
+        snapshot = HappyPlaces(":memory:")
+        with self._reader() as conn, snapshot._writes.lock:
+            conn.backup(snapshot._writes.conn)
+        return snapshot
+
+    def maintenance(self) -> None:
+        """Refresh planner statistics, e.g. after a large bulk import"""
+        self._check_not_in_bulk("run maintenance")
+        self.flush()
+        with self._writes.lock:
+            self._writes.conn.execute("ANALYZE")
+            self._conn.execute("PRAGMA optimize")
 
     def _init_db(self):
         """Initialize database schema"""
-        with self._connect() as conn:
+        with self._writes.transaction() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS items (
                     item_id TEXT PRIMARY KEY,
@@ -104,7 +489,96 @@ class HappyPlaces:
                 )
             """)
             
-            conn.commit()
+            # Running placement counts per (zone, distribution_type, routine,
+            # motive), kept up to date by a trigger so pattern queries don't
+            # have to scan all of placements
+            has_counts = conn.execute("""
+                SELECT 1 FROM sqlite_master WHERE name = 'placement_counts'
+            """).fetchone()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS placement_counts (
+                    zone TEXT,
+                    distribution_type TEXT,
+                    routine TEXT,
+                    motive TEXT,
+                    count INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_placement_counts_key
+                ON placement_counts(zone, distribution_type, routine, motive)
+            """)
+            if not has_counts:
+                conn.execute("""
+                    INSERT INTO placement_counts
+                    (zone, distribution_type, routine, motive, count)
+                    SELECT zone, distribution_type, routine, motive, COUNT(*)
+                    FROM placements
+                    GROUP BY zone, distribution_type, routine, motive
+                """)
+            # routine/motive are often NULL, which a UNIQUE key treats as
+            # distinct, so the trigger matches with IS instead of ON CONFLICT
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_placement_counts
+                AFTER INSERT ON placements
+                BEGIN
+                    INSERT INTO placement_counts
+                    (zone, distribution_type, routine, motive, count)
+                    SELECT NEW.zone, NEW.distribution_type, NEW.routine, NEW.motive, 0
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM placement_counts
+                        WHERE zone IS NEW.zone
+                        AND distribution_type IS NEW.distribution_type
+                        AND routine IS NEW.routine
+                        AND motive IS NEW.motive
+                    );
+                    UPDATE placement_counts SET count = count + 1
+                    WHERE zone IS NEW.zone
+                    AND distribution_type IS NEW.distribution_type
+                    AND routine IS NEW.routine
+                    AND motive IS NEW.motive;
+                END
+            """)
+            
+            # Indexes for the "latest per item/zone" lookups. The per-item
+            # index includes the placement_id tie-break so newest-first reads
+            # need no sort; it replaces the older (item_id, timestamp) one.
+            conn.execute("DROP INDEX IF EXISTS idx_placements_item_ts")
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_placements_item_ts_id
+                ON placements(item_id, timestamp DESC, placement_id DESC)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_placements_zone_ts
+                ON placements(zone, timestamp DESC)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_copresence_a_ts
+                ON co_presence(item_a, timestamp DESC)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_copresence_b_ts
+                ON co_presence(item_b, timestamp DESC)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_items_category
+                ON items(category)
+            """)
+            
+            # Gather planner statistics until the main tables have some, so
+            # the indexes get used. ANALYZE on empty tables records nothing,
+            # so a new database keeps retrying (cheaply) until it has data.
+            has_stats = conn.execute("""
+                SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'
+            """).fetchone() and conn.execute("""
+                SELECT 1 FROM sqlite_stat1
+                WHERE tbl IN ('placements', 'co_presence')
+            """).fetchone()
+            if not has_stats:
+                conn.execute("ANALYZE")
+        
+        # WAL lets the reader connection run alongside the writer
+        self._writes.conn.execute("PRAGMA journal_mode=WAL")
 
     # ===== ITEM REGISTRATION =====
     
@@ -117,7 +591,7 @@ class HappyPlaces:
                      current_quantity: Optional[int] = None,
                      refill_threshold: Optional[int] = None,
                      usage_rate_per_day: Optional[float] = None,
-                     metadata: Optional[Dict] = None) -> None:
+                     metadata: Optional[Dict] = None) -> Future:
         """
         Register a new item.
         
@@ -131,17 +605,31 @@ class HappyPlaces:
             refill_threshold: When to alert for refill
             usage_rate_per_day: For estimating when refill needed
             metadata: Additional custom data
+        
+        Returns:
+            Future that resolves once the write is committed
         """
-        with self._connect() as conn:
-            conn.execute("""
-                INSERT OR REPLACE INTO items 
-                (item_id, label, category, purchase_date, expected_lifespan_years,
-                 current_quantity, refill_threshold, usage_rate_per_day, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (item_id, label, category, purchase_date, expected_lifespan_years,
-                  current_quantity, refill_threshold, usage_rate_per_day,
-                  json.dumps(metadata or {})))
-            conn.commit()
+        return self._submit([(self._stmt_insert_item, [(
+            item_id, label, category, purchase_date, expected_lifespan_years,
+            current_quantity, refill_threshold, usage_rate_per_day,
+            _dump_metadata(metadata))])])
+
+    def register_items(self, rows: List[Dict]) -> Future:
+        """
+        Register many items in a single transaction.
+        
+        Args:
+            rows: Dicts taking the same keys as register_item()
+        
+        Returns:
+            Future that resolves once the write is committed
+        """
+        params = [(r["item_id"], r["label"], r["category"], r.get("purchase_date"),
+                   r.get("expected_lifespan_years"), r.get("current_quantity"),
+                   r.get("refill_threshold"), r.get("usage_rate_per_day"),
+                   _dump_metadata(r.get("metadata"))) for r in rows]
+        
+        return self._submit([(self._stmt_insert_item, params)])
 
     # ===== PLACEMENT TRACKING =====
     
@@ -153,7 +641,7 @@ class HappyPlaces:
                         motive: Optional[str] = None,
                         seen_with: Optional[List[str]] = None,
                         timestamp: Optional[str] = None,
-                        metadata: Optional[Dict] = None) -> None:
+                        metadata: Optional[Dict] = None) -> Future:
         """
         Record where an item is placed and how it's distributed.
         
@@ -166,232 +654,273 @@ class HappyPlaces:
             seen_with: List of other item_ids present at same time
             timestamp: ISO timestamp (defaults to now)
             metadata: Additional custom data
+        
+        Returns:
+            Future that resolves once the write is committed
         """
         if timestamp is None:
             timestamp = datetime.datetime.utcnow().isoformat()
         
-        with self._connect() as conn:
-            conn.execute("""
-                INSERT INTO placements 
-                (item_id, zone, distribution_type, routine, motive, timestamp, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (item_id, zone, distribution_type, routine, motive, timestamp,
-                  json.dumps(metadata or {})))
-            
-            # Record co-presence if seen with other items
-            if seen_with:
-                for other_id in seen_with:
-                    conn.execute("""
-                        INSERT INTO co_presence (item_a, item_b, zone, timestamp)
-                        VALUES (?, ?, ?, ?)
-                    """, (item_id, other_id, zone, timestamp))
-                    # Record reverse for easier querying
-                    conn.execute("""
-                        INSERT INTO co_presence (item_a, item_b, zone, timestamp)
-                        VALUES (?, ?, ?, ?)
-                    """, (other_id, item_id, zone, timestamp))
-            
-            conn.commit()
+        ops = [(self._stmt_insert_placement, [(
+            item_id, zone, distribution_type, routine, motive, timestamp,
+            _dump_metadata(metadata))])]
+        
+        # Record co-presence if seen with other items; each pair is
+        # stored once, with item_a < item_b
+        if seen_with:
+            rows = [(min(item_id, o), max(item_id, o), zone, timestamp)
+                    for o in seen_with]
+            ops.append((self._stmt_insert_copresence, rows))
+        
+        return self._submit(ops)
+
+    def record_placements(self, rows: List[Dict]) -> Future:
+        """
+        Record many placements in a single transaction.
+        
+        Rows without a timestamp all share the same "now". When several of
+        them are for one item, the last row in the list counts as the
+        current placement, since ties are broken by insertion order.
+        
+        Args:
+            rows: Dicts taking the same keys as record_placement()
+        
+        Returns:
+            Future that resolves once the write is committed
+        """
+        now = datetime.datetime.utcnow().isoformat()
+        placements = []
+        co_presence = []
+        for r in rows:
+            timestamp = r.get("timestamp") or now
+            placements.append((r["item_id"], r["zone"], r.get("distribution_type", "placed"),
+                               r.get("routine"), r.get("motive"), timestamp,
+                               _dump_metadata(r.get("metadata"))))
+            for o in r.get("seen_with") or []:
+                co_presence.append((min(r["item_id"], o), max(r["item_id"], o),
+                                    r["zone"], timestamp))
+        
+        return self._submit([(self._stmt_insert_placement, placements),
+                             (self._stmt_insert_copresence, co_presence)])
 
     # ===== ZONE MANAGEMENT =====
     
-    def register_zone(self, zone_id: str, zone_name: str, description: str = "") -> None:
-        """Register a new zone/space"""
-        with self._connect() as conn:
-            conn.execute("""
-                INSERT OR REPLACE INTO zones (zone_id, zone_name, description)
-                VALUES (?, ?, ?)
-            """, (zone_id, zone_name, description))
-            conn.commit()
+    def register_zone(self, zone_id: str, zone_name: str, description: str = "") -> Future:
+        """Register a new zone/space; the returned Future resolves once committed"""
+        return self._submit([(self._stmt_insert_zone, [(zone_id, zone_name, description)])])
 
     def list_zones(self) -> List[Dict]:
         """Get all registered zones"""
-        with self._connect() as conn:
+        with self._reader() as conn:
             rows = conn.execute("SELECT zone_id, zone_name, description FROM zones").fetchall()
-            return [{"zone_id": r[0], "zone_name": r[1], "description": r[2]} for r in rows]
+        return [{"zone_id": r[0], "zone_name": r[1], "description": r[2]} for r in rows]
 
     # ===== QUERIES =====
     
     def item_status(self, item_id: str) -> Optional[Dict[str, Any]]:
         """Get current status of an item including lifecycle info"""
-        with self._connect() as conn:
+        with self._reader() as conn:
             # Get item details
-            item = conn.execute("""
-                SELECT label, category, purchase_date, expected_lifespan_years,
-                       current_quantity, refill_threshold, usage_rate_per_day, metadata
-                FROM items WHERE item_id = ?
-            """, (item_id,)).fetchone()
+            item = conn.execute(self._stmt_item_row, (item_id,)).fetchone()
             
             if not item:
                 return None
             
             # Get latest placement
-            placement = conn.execute("""
-                SELECT zone, distribution_type, routine, motive, timestamp
-                FROM placements WHERE item_id = ?
-                ORDER BY timestamp DESC LIMIT 1
-            """, (item_id,)).fetchone()
+            placement = conn.execute(self._stmt_latest_placement, (item_id,)).fetchone()
+        
+        return self._build_status(item_id, item, placement)
+
+    def _build_status(self, item_id: str, item: tuple, placement: Optional[tuple],
+                      now: Optional[datetime.datetime] = None) -> Dict[str, Any]:
+        """
+        Assemble an item_status() dict from an items row and its latest placement.
+        
+        Batch callers pass a shared `now` so the clock is read once per batch.
+        """
+        result = {
+            "item_id": item_id,
+            "label": item[0],
+            "category": item[1],
+            "metadata": _load_metadata(item[7])
+        }
+        
+        # Add lifecycle info based on category
+        if item[1] == "good_stuff" and item[2] and item[3]:
+            lifespan_years = item[3]
+            age_years = _age_days(item[2], now or datetime.datetime.now()) * _YEARS_PER_DAY
+            remaining_years = max(0, lifespan_years - age_years)
             
-            result = {
-                "item_id": item_id,
-                "label": item[0],
-                "category": item[1],
-                "metadata": json.loads(item[7])
+            result["lifecycle"] = {
+                "purchase_date": item[2],
+                "age_years": round(age_years, 1),
+                "expected_lifespan_years": lifespan_years,
+                "remaining_years": round(remaining_years, 1),
+                "health_percent": round((remaining_years / lifespan_years) * 100, 1)
             }
+        
+        elif item[1] == "refillable":
+            quantity = item[4] or 0
+            threshold = item[5] or 0
+            usage_rate = item[6] or 0
             
-            # Add lifecycle info based on category
-            if item[1] == "good_stuff" and item[2] and item[3]:
-                purchase = datetime.datetime.fromisoformat(item[2])
-                lifespan_years = item[3]
-                age_years = (datetime.datetime.now() - purchase).days / 365.25
-                remaining_years = max(0, lifespan_years - age_years)
-                
-                result["lifecycle"] = {
-                    "purchase_date": item[2],
-                    "age_years": round(age_years, 1),
-                    "expected_lifespan_years": lifespan_years,
-                    "remaining_years": round(remaining_years, 1),
-                    "health_percent": round((remaining_years / lifespan_years) * 100, 1)
-                }
-            
-            elif item[1] == "refillable":
-                quantity = item[4] or 0
-                threshold = item[5] or 0
-                usage_rate = item[6] or 0
-                
-                days_remaining = (quantity / usage_rate) if usage_rate > 0 else None
-                
-                result["refill_status"] = {
-                    "current_quantity": quantity,
-                    "refill_threshold": threshold,
-                    "needs_refill": quantity <= threshold,
-                    "days_remaining": round(days_remaining, 1) if days_remaining else None
-                }
-            
-            # Add current placement
-            if placement:
-                result["current_placement"] = {
-                    "zone": placement[0],
-                    "distribution_type": placement[1],
-                    "routine": placement[2],
-                    "motive": placement[3],
-                    "timestamp": placement[4]
-                }
+            days_remaining = (quantity / usage_rate) if usage_rate > 0 else None
             
-            return result
+            result["refill_status"] = {
+                "current_quantity": quantity,
+                "refill_threshold": threshold,
+                "needs_refill": quantity <= threshold,
+                "days_remaining": round(days_remaining, 1) if days_remaining else None
+            }
+        
+        # Add current placement
+        if placement:
+            result["current_placement"] = {
+                "zone": placement[0],
+                "distribution_type": placement[1],
+                "routine": placement[2],
+                "motive": placement[3],
+                "timestamp": placement[4]
+            }
+        
+        return result
 
     def placement_history(self, item_id: str, limit: int = 20) -> List[Dict]:
         """Get movement history for an item"""
-        with self._connect() as conn:
+        with self._reader() as conn:
             rows = conn.execute("""
                 SELECT zone, distribution_type, routine, motive, timestamp, metadata
                 FROM placements WHERE item_id = ?
-                ORDER BY timestamp DESC LIMIT ?
+                ORDER BY timestamp DESC, placement_id DESC LIMIT ?
             """, (item_id, limit)).fetchall()
-            
-            return [{
-                "zone": r[0],
-                "distribution_type": r[1],
-                "routine": r[2],
-                "motive": r[3],
-                "timestamp": r[4],
-                "metadata": json.loads(r[5])
-            } for r in rows]
+        
+        return [{
+            "zone": r[0],
+            "distribution_type": r[1],
+            "routine": r[2],
+            "motive": r[3],
+            "timestamp": r[4],
+            "metadata": _load_metadata(r[5])
+        } for r in rows]
 
     def recent_neighbors(self, item_id: str, limit: int = 10) -> List[Dict]:
         """Get items recently seen with this item"""
-        with self._connect() as conn:
+        with self._reader() as conn:
+            # Pairs are stored once, so merge index-ordered scans of both sides
+            # of the edge and keep each neighbor's most recent sighting. The
+            # cursor is read row by row, so the scan stops once `limit` distinct
+            # neighbors have been seen; it's closed before returning so the read
+            # connection doesn't stay on this snapshot.
             rows = conn.execute("""
-                SELECT DISTINCT c.item_b, i.label, c.zone, c.timestamp
+                SELECT c.item_b, i.label, c.zone, c.timestamp
                 FROM co_presence c
                 JOIN items i ON c.item_b = i.item_id
                 WHERE c.item_a = ?
-                ORDER BY c.timestamp DESC LIMIT ?
-            """, (item_id, limit)).fetchall()
+                UNION ALL
+                SELECT c.item_a, i.label, c.zone, c.timestamp
+                FROM co_presence c
+                JOIN items i ON c.item_a = i.item_id
+                WHERE c.item_b = ?
+                ORDER BY 4 DESC
+            """, (item_id, item_id))
             
-            return [{
-                "item_id": r[0],
-                "label": r[1],
-                "zone": r[2],
-                "timestamp": r[3]
-            } for r in rows]
+            neighbors = {}
+            try:
+                for r in rows:
+                    if len(neighbors) >= limit:
+                        break
+                    if r[0] not in neighbors:
+                        neighbors[r[0]] = {
+                            "item_id": r[0],
+                            "label": r[1],
+                            "zone": r[2],
+                            "timestamp": r[3]
+                        }
+            finally:
+                rows.close()
+        
+        return list(neighbors.values())
 
     def items_in_zone(self, zone: str) -> List[Dict]:
         """Get all items currently in a zone"""
-        with self._connect() as conn:
-            # Get latest placement for each item in this zone
+        with self._reader() as conn:
+            # Rank each item's placements newest-first and keep those whose
+            # latest placement is in this zone
             rows = conn.execute("""
-                SELECT DISTINCT i.item_id, i.label, i.category,
+                SELECT i.item_id, i.label, i.category,
                        p.distribution_type, p.timestamp
                 FROM items i
-                JOIN placements p ON i.item_id = p.item_id
-                WHERE p.zone = ?
-                AND p.timestamp = (
-                    SELECT MAX(timestamp) FROM placements 
-                    WHERE item_id = i.item_id
-                )
+                JOIN (
+                    SELECT item_id, zone, distribution_type, timestamp,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY item_id
+                               ORDER BY timestamp DESC, placement_id DESC
+                           ) AS rn
+                    FROM placements
+                ) p ON p.item_id = i.item_id
+                WHERE p.rn = 1 AND p.zone = ?
             """, (zone,)).fetchall()
-            
-            return [{
-                "item_id": r[0],
-                "label": r[1],
-                "category": r[2],
-                "distribution_type": r[3],
-                "last_updated": r[4]
-            } for r in rows]
+        
+        return [{
+            "item_id": r[0],
+            "label": r[1],
+            "category": r[2],
+            "distribution_type": r[3],
+            "last_updated": r[4]
+        } for r in rows]
 
     # ===== PATTERN ANALYSIS =====
     
     def distribution_patterns(self) -> Dict[str, Any]:
         """Analyze how items are distributed (stack, spread, etc.)"""
-        with self._connect() as conn:
+        with self._reader() as conn:
             # Count by distribution type
             counts = conn.execute("""
-                SELECT distribution_type, COUNT(*) as count
-                FROM placements
+                SELECT distribution_type, SUM(count) as count
+                FROM placement_counts
                 GROUP BY distribution_type
             """).fetchall()
             
             # Distribution by zone
             by_zone = conn.execute("""
-                SELECT zone, distribution_type, COUNT(*) as count
-                FROM placements
+                SELECT zone, distribution_type, SUM(count) as count
+                FROM placement_counts
                 GROUP BY zone, distribution_type
             """).fetchall()
-            
-            return {
-                "overall_counts": {r[0]: r[1] for r in counts},
-                "by_zone": [{
-                    "zone": r[0],
-                    "distribution_type": r[1],
-                    "count": r[2]
-                } for r in by_zone]
-            }
+        
+        return {
+            "overall_counts": {r[0]: r[1] for r in counts},
+            "by_zone": [{
+                "zone": r[0],
+                "distribution_type": r[1],
+                "count": r[2]
+            } for r in by_zone]
+        }
 
     def routine_insights(self) -> List[Dict]:
         """Find patterns in routines and motives"""
-        with self._connect() as conn:
+        with self._reader() as conn:
             rows = conn.execute("""
-                SELECT routine, motive, COUNT(*) as frequency,
+                SELECT routine, motive, SUM(count) as frequency,
                        GROUP_CONCAT(DISTINCT zone) as zones
-                FROM placements
+                FROM placement_counts
                 WHERE routine IS NOT NULL
                 GROUP BY routine, motive
                 ORDER BY frequency DESC
             """).fetchall()
-            
-            return [{
-                "routine": r[0],
-                "motive": r[1],
-                "frequency": r[2],
-                "zones": r[3].split(',') if r[3] else []
-            } for r in rows]
+        
+        return [{
+            "routine": r[0],
+            "motive": r[1],
+            "frequency": r[2],
+            "zones": r[3].split(',') if r[3] else []
+        } for r in rows]
 
     def items_needing_attention(self) -> Dict[str, List[Dict]]:
         """Get items that need refill or replacement soon"""
         attention = {"refill_needed": [], "replacement_soon": []}
         
-        with self._connect() as conn:
+        with self._reader() as conn:
             # Check refillables
             refillables = conn.execute("""
                 SELECT item_id, label, current_quantity, refill_threshold
@@ -407,67 +936,108 @@ class HappyPlaces:
                 "threshold": r[3]
             } for r in refillables]
             
-            # Check good_stuff nearing end of life
+            # Check good_stuff nearing end of life (less than 20% life remaining),
+            # letting SQLite do the age arithmetic and filtering
             aging = conn.execute("""
-                SELECT item_id, label, purchase_date, expected_lifespan_years
-                FROM items
-                WHERE category = 'good_stuff'
-                AND purchase_date IS NOT NULL
-                AND expected_lifespan_years IS NOT NULL
+                SELECT item_id, label, remaining_years, expected_lifespan_years
+                FROM (
+                    SELECT item_id, label, expected_lifespan_years,
+                           expected_lifespan_years - CAST(
+                               julianday('now', 'localtime') - julianday(purchase_date)
+                               AS INTEGER
+                           ) / 365.25 AS remaining_years
+                    FROM items
+                    WHERE category = 'good_stuff'
+                    AND purchase_date IS NOT NULL
+                    AND expected_lifespan_years IS NOT NULL
+                )
+                WHERE remaining_years > 0
+                AND remaining_years < expected_lifespan_years * 0.2
             """).fetchall()
-            
-            for item in aging:
-                purchase = datetime.datetime.fromisoformat(item[2])
-                lifespan_years = item[3]
-                age_years = (datetime.datetime.now() - purchase).days / 365.25
-                remaining_years = lifespan_years - age_years
-                
-                # Alert if less than 20% life remaining
-                if remaining_years < (lifespan_years * 0.2) and remaining_years > 0:
-                    attention["replacement_soon"].append({
-                        "item_id": item[0],
-                        "label": item[1],
-                        "remaining_years": round(remaining_years, 1),
-                        "health_percent": round((remaining_years / lifespan_years) * 100, 1)
-                    })
+        
+        attention["replacement_soon"] = [{
+            "item_id": r[0],
+            "label": r[1],
+            "remaining_years": round(r[2], 1),
+            "health_percent": round((r[2] / r[3]) * 100, 1)
+        } for r in aging]
         
         return attention
 
     def all_items(self) -> List[Dict]:
         """Get all registered items"""
-        with self._connect() as conn:
+        with self._reader() as conn:
             rows = conn.execute("""
                 SELECT item_id, label, category
                 FROM items
                 ORDER BY label
             """).fetchall()
-            
-            return [{
-                "item_id": r[0],
-                "label": r[1],
-                "category": r[2]
-            } for r in rows]
+        
+        return [{
+            "item_id": r[0],
+            "label": r[1],
+            "category": r[2]
+        } for r in rows]
 
     # ===== DATA EXPORT =====
     
     def export_to_json(self, filepath: str = "happy_places_export.json") -> None:
         """Export all data to JSON file for GitHub Pages"""
-        data = {
-            "exported_at": datetime.datetime.utcnow().isoformat(),
-            "items": [],
-            "zones": self.list_zones(),
-            "patterns": self.distribution_patterns(),
-            "attention": self.items_needing_attention()
-        }
-        
-        # Export each item with full status
-        for item in self.all_items():
-            status = self.item_status(item["item_id"])
-            if status:
-                data["items"].append(status)
-        
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        # Write next to the target and swap it in at the end, so a failed
+        # export never leaves a truncated file behind
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filepath)),
+                                        prefix=".happy_places_export_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write('{\n  "exported_at": ')
+                f.write(_dump_json(datetime.datetime.utcnow().isoformat()))
+                f.write(',\n  "items": [')
+                
+                count = 0
+                now = datetime.datetime.now()
+                with self._reader() as conn:
+                    # Items are streamed straight from the cursor, fetching
+                    # items and their latest placement in one pass, so memory
+                    # use doesn't grow with the number of items
+                    rows = conn.execute("""
+                        SELECT i.item_id, i.label, i.category, i.purchase_date,
+                               i.expected_lifespan_years, i.current_quantity,
+                               i.refill_threshold, i.usage_rate_per_day, i.metadata,
+                               p.placement_id, p.zone, p.distribution_type, p.routine,
+                               p.motive, p.timestamp
+                        FROM items i
+                        LEFT JOIN (
+                            SELECT placement_id, item_id, zone, distribution_type, routine,
+                                   motive, timestamp,
+                                   ROW_NUMBER() OVER (
+                                       PARTITION BY item_id
+                                       ORDER BY timestamp DESC, placement_id DESC
+                                   ) AS rn
+                            FROM placements
+                        ) p ON p.item_id = i.item_id AND p.rn = 1
+                        ORDER BY i.label
+                    """)
+                    
+                    for r in rows:
+                        placement = r[10:] if r[9] is not None else None
+                        status = self._build_status(r[0], r[1:9], placement, now)
+                        f.write(",\n    " if count else "\n    ")
+                        f.write(_dump_json(status).replace("\n", "\n    "))
+                        count += 1
+                f.write("\n  ]" if count else "]")
+                
+                for key, value in (("zones", self.list_zones()),
+                                   ("patterns", self.distribution_patterns()),
+                                   ("attention", self.items_needing_attention())):
+                    f.write(f',\n  "{key}": ')
+                    f.write(_dump_json(value).replace("\n", "\n  "))
+                f.write("\n}")
+            # mkstemp creates the file owner-only; keep the export readable
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
         
         print(f"✓ Exported to {filepath}")
 
@@ -495,94 +1065,96 @@ if __name__ == "__main__":
     if command == "demo":
         print("Running Happy Places demo...\n")
         
-        # Register some zones
-        hp.register_zone("bathroom_left_side", "Bathroom Left Side", "Near sink")
-        hp.register_zone("bathroom_right_side", "Bathroom Right Side", "Near toilet")
-        hp.register_zone("bedroom_floor", "Bedroom Floor")
-        hp.register_zone("kitchen_table", "Kitchen Table")
-        hp.register_zone("kitchen_counter", "Kitchen Counter")
-        
-        # Register items
-        hp.register_item(
-            "trash_can_bathroom",
-            label="Bathroom Trash Can",
-            category="good_stuff",
-            purchase_date="2023-01-15",
-            expected_lifespan_years=5
-        )
-        
-        hp.register_item(
-            "toothbrush",
-            label="Electric Toothbrush",
-            category="refillable",
-            current_quantity=45,
-            refill_threshold=10,
-            usage_rate_per_day=1
-        )
-        
-        hp.register_item(
-            "left_sock",
-            label="Left Sock (Blue)",
-            category="good_stuff",
-            purchase_date="2024-06-01",
-            expected_lifespan_years=2
-        )
-        
-        hp.register_item(
-            "wallet",
-            label="Leather Wallet",
-            category="good_stuff",
-            purchase_date="2020-03-10",
-            expected_lifespan_years=8
-        )
-        
-        hp.register_item(
-            "salt_shaker",
-            label="Salt Shaker",
-            category="refillable",
-            current_quantity=20,
-            refill_threshold=15,
-            usage_rate_per_day=0.5
-        )
-        
-        # Record some placements
-        hp.record_placement(
-            "trash_can_bathroom",
-            zone="bathroom_left_side",
-            distribution_type="placed",
-            routine="night routine",
-            motive="reachability"
-        )
-        
-        hp.record_placement(
-            "toothbrush",
-            zone="bathroom_left_side",
-            distribution_type="placed",
-            routine="morning routine",
-            seen_with=["trash_can_bathroom"]
-        )
-        
-        hp.record_placement(
-            "left_sock",
-            zone="bedroom_floor",
-            distribution_type="spread",
-            routine="undressing",
-            motive="fatigue"
-        )
-        
-        hp.record_placement(
-            "wallet",
-            zone="kitchen_table",
-            distribution_type="stack",
-            seen_with=["left_sock"],
-            motive="convenience"
-        )
-        
-        hp.record_placement(
-            "salt_shaker",
-            zone="kitchen_counter",
-            distribution_type="placed"
-        )
+        # Seed everything in one transaction
+        with hp.bulk():
+            # Register some zones
+            hp.register_zone("bathroom_left_side", "Bathroom Left Side", "Near sink")
+            hp.register_zone("bathroom_right_side", "Bathroom Right Side", "Near toilet")
+            hp.register_zone("bedroom_floor", "Bedroom Floor")
+            hp.register_zone("kitchen_table", "Kitchen Table")
+            hp.register_zone("kitchen_counter", "Kitchen Counter")
+        
+            # Register items
+            hp.register_item(
+                "trash_can_bathroom",
+                label="Bathroom Trash Can",
+                category="good_stuff",
+                purchase_date="2023-01-15",
+                expected_lifespan_years=5
+            )
+        
+            hp.register_item(
+                "toothbrush",
+                label="Electric Toothbrush",
+                category="refillable",
+                current_quantity=45,
+                refill_threshold=10,
+                usage_rate_per_day=1
+            )
+        
+            hp.register_item(
+                "left_sock",
+                label="Left Sock (Blue)",
+                category="good_stuff",
+                purchase_date="2024-06-01",
+                expected_lifespan_years=2
+            )
+        
+            hp.register_item(
+                "wallet",
+                label="Leather Wallet",
+                category="good_stuff",
+                purchase_date="2020-03-10",
+                expected_lifespan_years=8
+            )
+        
+            hp.register_item(
+                "salt_shaker",
+                label="Salt Shaker",
+                category="refillable",
+                current_quantity=20,
+                refill_threshold=15,
+                usage_rate_per_day=0.5
+            )
+        
+            # Record some placements
+            hp.record_placement(
+                "trash_can_bathroom",
+                zone="bathroom_left_side",
+                distribution_type="placed",
+                routine="night routine",
+                motive="reachability"
+            )
+        
+            hp.record_placement(
+                "toothbrush",
+                zone="bathroom_left_side",
+                distribution_type="placed",
+                routine="morning routine",
+                seen_with=["trash_can_bathroom"]
+            )
+        
+            hp.record_placement(
+                "left_sock",
+                zone="bedroom_floor",
+                distribution_type="spread",
+                routine="undressing",
+                motive="fatigue"
+            )
+        
+            hp.record_placement(
+                "wallet",
+                zone="kitchen_table",
+                distribution_type="stack",
+                seen_with=["left_sock"],
+                motive="convenience"
+            )
+        
+            hp.record_placement(
+                "salt_shaker",
+                zone="kitchen_counter",
+                distribution_type="placed"
+            )
         
         print("✓ Demo data created!")
         print("\nTry these commands:")
@@ -639,3 +1211,5 @@ if __name__ == "__main__":
     else:
         print(f"Unknown command: {command}")
         print("Run without arguments to see usage.")
+    
+    hp.close()
@@ -0,0 +1,169 @@
+import importlib.util
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from concurrent.futures import wait
+
+try:
+    import dateutil  # noqa: F401
+except ImportError:
+    raise unittest.SkipTest("python-dateutil is not installed")
+
+# Happy-Places.py isn't importable by name, so load it from its path
+_spec = importlib.util.spec_from_file_location(
+    "happy_places",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Happy-Places.py"))
+happy_places = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(happy_places)
+HappyPlaces = happy_places.HappyPlaces
+
+
+class WriteQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.hp = HappyPlaces(":memory:")
+
+    def tearDown(self):
+        try:
+            self.hp.close()
+        except sqlite3.Error:
+            pass
+
+    def test_read_your_own_write(self):
+        self.hp.register_item("wallet", label="Wallet", category="good_stuff")
+        self.hp.record_placement("wallet", zone="kitchen_table", distribution_type="placed")
+        status = self.hp.item_status("wallet")
+        self.assertEqual(status["current_placement"]["zone"], "kitchen_table")
+
+    def test_failed_write_in_batch(self):
+        # Hold the writer so the queued writes are committed as one batch
+        with self.hp._writes.lock:
+            first = self.hp.register_item("keys", label="Keys", category="good_stuff")
+            bad = self.hp.register_item("junk", label="Junk", category="bogus")
+            last = self.hp.register_item("phone", label="Phone", category="good_stuff")
+
+        self.assertIsNone(first.result())
+        self.assertIsNone(last.result())
+        with self.assertRaises(sqlite3.IntegrityError):
+            bad.result()
+        self.hp.flush()
+        self.assertEqual({i["item_id"] for i in self.hp.all_items()}, {"keys", "phone"})
+
+    def test_unseen_failure_raised_by_flush_once(self):
+        self.hp.register_item("junk", label="Junk", category="bogus")
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.hp.flush()
+        self.hp.flush()
+
+    def test_failure_from_another_thread(self):
+        futures = []
+
+        def worker():
+            futures.append(self.hp.register_item("junk", label="Junk", category="bogus"))
+            wait(futures)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        # Only the submitting thread sees the failure
+        self.hp.flush()
+        self.assertEqual(self.hp.all_items(), [])
+        self.assertIsInstance(futures[0].exception(), sqlite3.IntegrityError)
+
+    def test_unchecked_failure_dies_with_its_thread(self):
+        def worker():
+            self.hp.register_item("junk", label="Junk", category="bogus")
+
+        for _ in range(5):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+        # Threads started later may reuse the idents of the ones above
+        errors = []
+
+        def reader():
+            try:
+                self.hp.flush()
+                self.hp.all_items()
+            except sqlite3.Error as exc:
+                errors.append(exc)
+
+        for _ in range(5):
+            thread = threading.Thread(target=reader)
+            thread.start()
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_memory_reads_while_writer_is_busy(self):
+        def writer():
+            for i in range(1000):
+                self.hp.register_item(f"item_{i}", label="Item", category="disposable")
+            self.hp.flush()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        # Would fail with "database table is locked" if a read ran mid-commit
+        while thread.is_alive():
+            self.hp.all_items()
+            self.hp.distribution_patterns()
+        thread.join()
+        self.assertEqual(len(self.hp.all_items()), 1000)
+
+    def test_close_drains_queue(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "happy_places.db")
+            hp = HappyPlaces(path)
+            hp.register_item("wallet", label="Wallet", category="good_stuff")
+            for i in range(500):
+                hp.record_placement("wallet", zone=f"zone_{i % 7}", distribution_type="placed")
+            hp.close()
+
+            with self.assertRaises(sqlite3.ProgrammingError):
+                hp.record_placement("wallet", zone="kitchen_table")
+
+            reopened = HappyPlaces(path)
+            try:
+                self.assertEqual(len(reopened.placement_history("wallet", limit=1000)), 500)
+            finally:
+                reopened.close()
+
+
+class ExportTest(unittest.TestCase):
+    def test_export_with_null_distribution_type(self):
+        hp = HappyPlaces(":memory:")
+        try:
+            hp.register_item("wallet", label="Wallet", category="good_stuff")
+            hp.record_placement("wallet", zone="kitchen_table", distribution_type=None)
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "export.json")
+                hp.export_to_json(path)
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                self.assertEqual(os.listdir(tmp), ["export.json"])
+        finally:
+            hp.close()
+        self.assertEqual(data["patterns"]["overall_counts"], {"null": 1})
+
+    def test_failed_export_keeps_previous_file(self):
+        hp = HappyPlaces(":memory:")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "export.json")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("previous")
+            # Fails partway through, after the items have been written
+            hp.distribution_patterns = lambda: {"bad": object()}
+            try:
+                with self.assertRaises(TypeError):
+                    hp.export_to_json(path)
+            finally:
+                hp.close()
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), "previous")
+            self.assertEqual(os.listdir(tmp), ["export.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()